@@ -1,14 +1,22 @@
-import statsapi
 from PIL import Image, ImageDraw, ImageFont
 import requests
 from io import BytesIO
-from datetime import datetime, timedelta
-import pytz # For timezone conversion
-# from github import Github # No longer needed for direct upload from script
-# from github.GithubException import UnknownObjectException # No longer needed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo # For timezone conversion
 import os
-import traceback # For more detailed error logging
+import logging
 import json # Added for JSON manipulation
+import hashlib # For stable cache keys
+import functools
+from itertools import chain
+import time
+import calendar
+from concurrent.futures import ThreadPoolExecutor
+
+logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO").upper(), format="%(asctime)s %(levelname)s %(message)s")
+log = logging.getLogger("trmnl_stlcards")
 
 # --- CONFIGURATION ---
 # GitHub repository details (used for constructing URLs in JSON, not for direct upload by this script)
@@ -22,184 +30,343 @@ LOCAL_IMAGE_FULL_PATH = IMAGE_PATH_IN_REPO # Python script will save it here loc
 
 JSON_REDIRECT_FILENAME = "trmnl_redirect.json" # Local filename for the JSON
 JSON_REDIRECT_PATH_IN_REPO = JSON_REDIRECT_FILENAME # Path in the repo for the JSON (e.g., root for Pages)
+DEBUG = os.environ.get("DEBUG", "").lower() in ("1", "true", "yes") # Pretty-print generated JSON
 
 
 # MLB Configuration
 TEAM_NAME = "St. Louis Cardinals"
 TEAM_ID = 138 # St. Louis Cardinals
+TEAM_LEAGUE_ID = 104 # National League; must match TEAM_ID (standings fall back to ALL_LEAGUE_IDS if it doesn't)
+TEAM_DIVISION_ID = 205 # NL Central; must match TEAM_ID, searched first in the standings records
+ALL_LEAGUE_IDS = "103,104" # AL + NL
 DAYS_AHEAD = 4 # Number of days of upcoming games to fetch
+# Only the schedule fields fetch_schedule/get_simplified_broadcasts read; the hydrated payload is otherwise mostly unused
+SCHEDULE_FIELDS = ("dates,date,games,gameDate,status,abstractGameState,teams,home,away,team,id,name,"
+                   "broadcasts,type,callSign,isNational,description,content,media,epg,title,items")
+# Likewise for fetch_standings: one row per team is all that is kept of the league-wide standings
+STANDINGS_FIELDS = ("records,division,id,nameShort,league,teamRecords,team,leagueRecord,wins,losses,"
+                    "divisionRank,leagueRank,gamesBack")
+GAME_TYPES = "S,R,F,D,L,W" # Spring, regular season and all postseason rounds; leaves out exhibitions
 DISPLAY_TIMEZONE = "America/Chicago" # Central Time
+_UTC = timezone.utc
+_TARGET_TZ = ZoneInfo(DISPLAY_TIMEZONE)
+_DAY_ABBR = list(calendar.day_abbr) # Indexed by datetime.weekday()
+_MONTH_ABBR = list(calendar.month_abbr) # Indexed by datetime.month
 
 # Image Configuration
 IMAGE_WIDTH = 800
 IMAGE_HEIGHT = 480
 BACKGROUND_COLOR = "white"
 TEXT_COLOR = "black"
-try:
-    FONT_PATH_REGULAR = "LiberationSans-Regular.ttf" 
-    FONT_PATH_BOLD = "LiberationSans-Bold.ttf"
-    ImageFont.truetype(FONT_PATH_REGULAR, 10) 
-    ImageFont.truetype(FONT_PATH_BOLD, 10)
-    print(f"Attempting to use Liberation fonts by name: {FONT_PATH_REGULAR}, {FONT_PATH_BOLD}")
-
-    FONT_SIZE_LARGE = 36
-    FONT_SIZE_MEDIUM_BOLD = 28
-    FONT_SIZE_MEDIUM = 26
-    FONT_SIZE_SMALL = 20
-    FONT_SIZE_XSMALL = 16
-except IOError:
-    print(f"Specified Liberation font files not found by name. Trying common full paths or defaulting.")
-    try:
-        FONT_PATH_REGULAR = "/usr/share/fonts/truetype/liberation2/LiberationSans-Regular.ttf"
-        FONT_PATH_BOLD = "/usr/share/fonts/truetype/liberation2/LiberationSans-Bold.ttf"
-        ImageFont.truetype(FONT_PATH_REGULAR, 10)
-        ImageFont.truetype(FONT_PATH_BOLD, 10)
-        print(f"Using full paths for Liberation fonts: {FONT_PATH_REGULAR}, {FONT_PATH_BOLD}")
-    except IOError:
-        print(f"Full paths for Liberation fonts also not found. Defaulting to Pillow's load_default() font.")
-        FONT_PATH_REGULAR = None 
-        FONT_PATH_BOLD = None    
-
-    FONT_SIZE_LARGE = 32
-    FONT_SIZE_MEDIUM_BOLD = 26
-    FONT_SIZE_MEDIUM = 24
-    FONT_SIZE_SMALL = 18
-    FONT_SIZE_XSMALL = 14
+# Greyscale ("L") is all the 1-bit output needs: 1 byte/pixel while drawing and a plain copy when pasting the "L" logo
+_CANVAS = Image.new("L", (IMAGE_WIDTH, IMAGE_HEIGHT), BACKGROUND_COLOR) # Reused and cleared by every render
+
+@functools.lru_cache(maxsize=32)
+def _load_font(path, size):
+    # Each (path, size) pair is parsed by FreeType once per process
+    return ImageFont.truetype(path, size)
+
+def _find_font_file(filename):
+    # Resolve a bare font filename like ImageFont.truetype does (cwd, then system font dirs) without parsing the TTF
+    if os.path.isfile(filename): return filename
+    if os.name == "nt":
+        font_dirs = [os.path.join(os.environ.get("WINDIR", "C:\\Windows"), "fonts")]
+    elif os.uname().sysname == "Darwin":
+        font_dirs = ["/Library/Fonts", "/System/Library/Fonts", os.path.expanduser("~/Library/Fonts")]
+    else:
+        data_dirs = [os.environ.get("XDG_DATA_HOME", os.path.expanduser("~/.local/share"))]
+        data_dirs += os.environ.get("XDG_DATA_DIRS", "/usr/local/share:/usr/share").split(":")
+        font_dirs = [os.path.join(d, "fonts") for d in data_dirs if d]
+    for font_dir in font_dirs:
+        for root, _, files in os.walk(font_dir):
+            if filename in files: return os.path.join(root, filename)
+    return None
+
+# (regular, bold, (large, medium_bold, medium, small, xsmall) sizes), in order of preference.
+# Bare filenames are looked up like ImageFont.truetype would; the first pair found on disk wins.
+FONT_CANDIDATES = [
+    ("LiberationSans-Regular.ttf", "LiberationSans-Bold.ttf", (36, 28, 26, 20, 16)),
+    ("/usr/share/fonts/truetype/liberation2/LiberationSans-Regular.ttf",
+     "/usr/share/fonts/truetype/liberation2/LiberationSans-Bold.ttf", (32, 26, 24, 18, 14)),
+    ("DejaVuSans.ttf", "DejaVuSans-Bold.ttf", (32, 26, 24, 18, 14)),
+]
+DEFAULT_FONT_SIZES = (32, 26, 24, 18, 14) # Used with Pillow's load_default() font
+
+FONT_PATH_REGULAR, FONT_PATH_BOLD, _font_sizes = None, None, DEFAULT_FONT_SIZES
+for _regular, _bold, _sizes in FONT_CANDIDATES:
+    _regular_path, _bold_path = _find_font_file(_regular), _find_font_file(_bold)
+    if _regular_path and _bold_path:
+        FONT_PATH_REGULAR, FONT_PATH_BOLD, _font_sizes = _regular_path, _bold_path, _sizes
+        log.info(f"Using fonts: {FONT_PATH_REGULAR}, {FONT_PATH_BOLD}")
+        break
+else:
+    log.warning("None of the configured font files were found. Defaulting to Pillow's load_default() font.")
+FONT_SIZE_LARGE, FONT_SIZE_MEDIUM_BOLD, FONT_SIZE_MEDIUM, FONT_SIZE_SMALL, FONT_SIZE_XSMALL = _font_sizes
+
+_FONT_SPECS = { # name -> (path, size) for every font create_schedule_image draws with
+    "large": (FONT_PATH_BOLD, FONT_SIZE_LARGE),
+    "medium_bold": (FONT_PATH_BOLD, FONT_SIZE_MEDIUM_BOLD),
+    "medium": (FONT_PATH_REGULAR, FONT_SIZE_MEDIUM),
+    "small": (FONT_PATH_REGULAR, FONT_SIZE_SMALL),
+    "small_bold": (FONT_PATH_BOLD, FONT_SIZE_SMALL),
+    "xsmall": (FONT_PATH_REGULAR, FONT_SIZE_XSMALL),
+}
 
 
 LOGO_URL = "https://a.espncdn.com/i/teamlogos/mlb/500/stl.png"
 LOGO_SIZE = (130, 130) 
+CACHE_DIR = os.environ.get("TRMNL_CACHE_DIR", ".cache") # Processed logo, API responses and render state persist here between runs
+LOGO_CACHE_TTL = 7 * 86400 # Re-download the logo at most once a week
+SCHEDULE_CACHE_TTL = 5 * 60 # Seconds a fetched schedule is reused (covers quick re-runs)
+STANDINGS_CACHE_TTL = 60 * 60 # Standings only move when a game ends; an hour keeps re-runs off the API without going stale
+RENDER_CACHE_PATH = os.path.join(CACHE_DIR, "render.sha256") # Hash of the inputs behind the current image
+
+# Shared HTTP session so keep-alive and the retry policy apply to every request we make
+_session = requests.Session()
+_session.headers.update({"User-Agent": "trmnl_stlcards/1.0"})
+_http_adapter = HTTPAdapter(
+    pool_connections=4, pool_maxsize=4,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+)
+_session.mount("http://", _http_adapter)
+_session.mount("https://", _http_adapter)
+
+class _SessionRequests:
+    # Stands in for the requests module inside statsapi: get() uses the pooled session, everything else is requests itself
+    def __getattr__(self, name): return getattr(requests, name)
+    def get(self, *args, **kwargs):
+        kwargs.setdefault("timeout", (3.05, 30))
+        return _session.get(*args, **kwargs)
+
+@functools.lru_cache(maxsize=None)
+def _get_statsapi():
+    # statsapi is imported on first use, so runs served entirely from the response cache never load it
+    import statsapi
+    if hasattr(statsapi, "requests"): statsapi.requests = _SessionRequests() # Schedule + standings share one connection
+    return statsapi
 
 # --- HELPER FUNCTIONS ---
+def _open_image_file(path):
+    logo_img = Image.open(path)
+    logo_img.load()
+    return logo_img
+
 def get_team_logo(url, size):
+    # hash() is salted per process, so key the cache file on a stable digest of the URL
+    url_key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    cache_path = os.path.join(CACHE_DIR, f"logo_{url_key}_{size[0]}x{size[1]}.png")
+    validators_path = cache_path + ".json" # ETag / Last-Modified of the source image
+    cached_logo, request_headers = None, {}
+    if os.path.exists(cache_path):
+        try:
+            cached_logo = _open_image_file(cache_path)
+        except Exception as e:
+            log.warning(f"Error reading cached logo, re-downloading: {e}")
+    if cached_logo is not None:
+        if time.time() - os.path.getmtime(cache_path) < LOGO_CACHE_TTL:
+            log.info(f"Using cached logo: {cache_path}")
+            return cached_logo
+        try:
+            with open(validators_path) as f: validators = json.load(f)
+            if validators.get("etag"): request_headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"): request_headers["If-Modified-Since"] = validators["last_modified"]
+        except (OSError, ValueError):
+            pass
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        logo_img = Image.open(BytesIO(response.content))
-        logo_img = logo_img.convert("RGBA")
-        bg = Image.new("RGBA", logo_img.size, (255,255,255,255))
-        logo_on_bg = Image.alpha_composite(bg, logo_img)
-        logo_on_bg = logo_on_bg.convert("L") 
-        logo_on_bg = logo_on_bg.resize(size, Image.Resampling.LANCZOS)
+        with _session.get(url, headers=request_headers, stream=True, timeout=(3.05, 10)) as response: # (connect, read)
+            if response.status_code == 304 and cached_logo is not None:
+                os.utime(cache_path) # Revalidated, restart the TTL
+                log.info(f"Logo not modified upstream. Using cached logo: {cache_path}")
+                return cached_logo
+            response.raise_for_status()
+            response.raw.decode_content = True # Undo any Content-Encoding before Pillow sees the bytes
+            logo_img = Image.open(response.raw)
+            # JPEG sources decode greyscale at a reduced DCT scale, leaving 2x headroom for LANCZOS; a no-op for the PNG logo
+            logo_img.draft("L", (size[0] * 2, size[1] * 2))
+            logo_img.load() # Decode while the connection is still open
+            validators = {"etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")}
+        if 'A' in logo_img.getbands() or 'transparency' in logo_img.info:
+            # Downscale first (Pillow resamples RGBA with premultiplied alpha), so the matte and greyscale passes touch ~16k pixels, not 250k
+            logo_img = logo_img.convert("RGBA").resize(size, Image.Resampling.LANCZOS)
+            import numpy as np # Only needed when a logo is actually (re)processed
+            rgba = np.asarray(logo_img, dtype=np.uint32); alpha = rgba[..., 3:]
+            rgb = (rgba[..., :3] * alpha + 255 * (255 - alpha) + 127) // 255 # Matte over white
+            # Same fixed-point ITU-R 601 weights as Pillow's convert("L"), fused with the matte in one pass
+            luma = (rgb[..., 0] * 19595 + rgb[..., 1] * 38470 + rgb[..., 2] * 7471 + 0x8000) >> 16
+            logo_on_bg = Image.fromarray(luma.astype(np.uint8))
+        else: logo_on_bg = logo_img.convert("L").resize(size, Image.Resampling.LANCZOS) # Opaque source: no matte needed
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            logo_on_bg.save(cache_path, optimize=True)
+            with open(validators_path, 'w') as f: json.dump(validators, f)
+        except OSError as e:
+            log.warning(f"Could not cache logo: {e}")
         return logo_on_bg 
     except requests.RequestException as e:
-        print(f"Error downloading logo: {e}")
+        log.warning(f"Error downloading logo: {e}")
     except Exception as e:
-        print(f"Error processing logo: {e}")
-    return None
+        log.warning(f"Error processing logo: {e}")
+    if cached_logo is not None: log.warning(f"Falling back to stale cached logo: {cache_path}")
+    return cached_logo
+
+def _truncate_to_width(draw, text, font, max_w, min_len=10):
+    # Binary search the longest text[:k] + "..." that fits, instead of measuring once per dropped character
+    if len(text) <= min_len or draw.textlength(text, font=font) <= max_w:
+        return text
+    lo, hi = min_len - 3, len(text) - 4
+    best = lo
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        if draw.textlength(text[:mid] + "...", font=font) <= max_w:
+            best = mid; lo = mid + 1
+        else:
+            hi = mid - 1
+    return text[:best] + "..."
 
 def format_game_time(game_date_utc_str, target_tz_str):
-    if not isinstance(game_date_utc_str, str): 
-        print(f"Warning: format_game_time received non-string input: {game_date_utc_str}")
+    # Type check before the lru_cache: an unhashable gameDate (list/dict) would otherwise raise out of the cache lookup
+    if not isinstance(game_date_utc_str, str) or not isinstance(target_tz_str, str): 
+        log.warning(f"format_game_time received non-string input: {game_date_utc_str}")
         return "Time TBD"
+    return _format_game_time(game_date_utc_str, target_tz_str)
+
+@functools.lru_cache(maxsize=256)
+def _format_game_time(game_date_utc_str, target_tz_str):
     try:
-        utc_tz = pytz.utc
-        target_tz = pytz.timezone(target_tz_str)
+        target_tz = _TARGET_TZ if target_tz_str == DISPLAY_TIMEZONE else ZoneInfo(target_tz_str)
         if game_date_utc_str.endswith('Z'):
             game_date_utc_str = game_date_utc_str[:-1]
+        date_part = game_date_utc_str.split('T')[0]
         dt_utc = None
-        formats_to_try = ["%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M:%S.%f", "%Y-%m-%d"]
-        for fmt in formats_to_try:
+        if date_part != game_date_utc_str: # A bare date means the start time is not set yet
             try:
-                dt_utc = datetime.strptime(game_date_utc_str, fmt)
-                if fmt == "%Y-%m-%d":
-                     return dt_utc.strftime("%a %b %d (Time TBD)")
-                break
+                dt_utc = datetime.fromisoformat(game_date_utc_str)
             except ValueError:
-                continue
+                pass
         if dt_utc is None:
             try:
-                dt_utc_date_only = datetime.strptime(game_date_utc_str.split('T')[0], "%Y-%m-%d")
-                return dt_utc_date_only.strftime("%a %b %d (Time TBD)")
+                dt = datetime.fromisoformat(date_part)
+                return f"{_DAY_ABBR[dt.weekday()]} {_MONTH_ABBR[dt.month]} {dt.day:02d} (Time TBD)"
             except ValueError:
-                print(f"Could not parse game date: {game_date_utc_str}")
+                log.warning(f"Could not parse game date: {game_date_utc_str}")
                 return "Time TBD"
-        dt_utc = utc_tz.localize(dt_utc)
+        if dt_utc.tzinfo is None: dt_utc = dt_utc.replace(tzinfo=_UTC) # Keep an explicit "+00:00"-style offset as given
         dt_target = dt_utc.astimezone(target_tz)
-        return dt_target.strftime("%a %b %d, %-I:%M %p %Z")
+        # Same output as strftime("%a %b %d, %-I:%M %p %Z"), but portable (no glibc-only %-I) and without format parsing
+        return (f"{_DAY_ABBR[dt_target.weekday()]} {_MONTH_ABBR[dt_target.month]} {dt_target.day:02d}, "
+                f"{(dt_target.hour - 1) % 12 + 1}:{dt_target.minute:02d} {'PM' if dt_target.hour >= 12 else 'AM'} {dt_target.tzname()}")
     except Exception as e:
-        print(f"Error formatting game time for {game_date_utc_str}: {e}")
+        log.warning(f"Error formatting game time for {game_date_utc_str}: {e}")
         return "Time TBD"
 
+_NATIONAL_TV_NAMES = frozenset({"ESPN", "FOX", "FS1", "TBS", "Apple TV+", "Peacock", "MLB Network"})
+_SKIP_BROADCAST_TYPES = frozenset({"AM", "FM"}) # Radio
+_FANDUEL_PREFIX = "FanDuel Sports Network"
+MAX_BROADCASTS_SHOWN = 3 # TV channels listed per game
+
+def _broadcast_key(broadcast):
+    # Normalise a broadcast dict to a hashable (type, name, callSign, isNational) tuple; None for non-dict items
+    if not isinstance(broadcast, dict): return None
+    b_type, name, call_sign = broadcast.get('type'), broadcast.get('name', broadcast.get('description')), broadcast.get('callSign')
+    return (b_type.upper() if isinstance(b_type, str) else '', name if isinstance(name, str) else '',
+            call_sign if isinstance(call_sign, str) else '', bool(broadcast.get('isNational')))
+
+def _classify_broadcast(b_type, name, call_sign, is_national):
+    # Returns (is_national, display_name) for a TV broadcast entry, or None if it should not be shown
+    if b_type in _SKIP_BROADCAST_TYPES: return None
+    if "MLB.TV" in name or b_type == "MLBTV": return None
+    is_tv_broadcast = (b_type == "TV" or (not b_type and name))
+    if name.startswith(_FANDUEL_PREFIX):
+        short_name = name.replace(_FANDUEL_PREFIX, "FanDuel").strip()
+        if not short_name or short_name == "FanDuel": short_name = "FanDuel SN" 
+        elif not short_name.startswith("FanDuel "): short_name = f"FanDuel {short_name}"
+        return is_national, short_name
+    if is_national or name in _NATIONAL_TV_NAMES:
+        return (True, name) if name else None
+    if is_tv_broadcast or name: 
+        if call_sign and call_sign not in name and len(call_sign) < 7 and len(call_sign) > 2 : return False, call_sign
+        if name: return False, name
+    return None
+
+@functools.lru_cache(maxsize=64)
+def _simplify_broadcast_items(items):
+    national_tv, regional_tv = {}, {} # dict.fromkeys-style ordered sets: dedup while keeping the API's order
+    for item in items:
+        classified = _classify_broadcast(*item)
+        if classified is None: continue
+        is_national, display_name = classified
+        if is_national:
+            national_tv[display_name] = None
+            if len(national_tv) >= MAX_BROADCASTS_SHOWN: break # Nationals fill every slot, regionals can't show
+        else: regional_tv[display_name] = None
+    display_list = dict.fromkeys(chain(national_tv, regional_tv)) # Nationals first, then regionals
+    return tuple(display_list)[:MAX_BROADCASTS_SHOWN] or ("TBD",)
+
 def get_simplified_broadcasts(game_data_item):
-    all_broadcast_items = []
-    if 'broadcasts' in game_data_item and isinstance(game_data_item['broadcasts'], list):
-        all_broadcast_items.extend(game_data_item['broadcasts'])
-    if ('content' in game_data_item and 
-        'media' in game_data_item['content'] and 
-        'epg' in game_data_item['content']['media'] and 
-        isinstance(game_data_item['content']['media']['epg'], list)):
-        for epg_group in game_data_item['content']['media']['epg']:
-            epg_title_raw = epg_group.get('title', '')
-            epg_title = epg_title_raw.upper() if isinstance(epg_title_raw, str) else ''
-            if epg_title in ["MLBTV", "TV"] and isinstance(epg_group.get('items'), list):
-                all_broadcast_items.extend(epg_group['items'])
-    if not all_broadcast_items: return ["TBD"] 
-    national_tv = set()
-    regional_tv = set()
-    for broadcast in all_broadcast_items:
-        if not isinstance(broadcast, dict): continue
-        b_type_raw = broadcast.get('type', '')
-        b_type = b_type_raw.upper() if isinstance(b_type_raw, str) else ''
-        if b_type in ["AM", "FM"]: continue
-        name_raw = broadcast.get('name', broadcast.get('description', ''))
-        name = name_raw if isinstance(name_raw, str) else ''
-        if "MLB.TV" in name or b_type == "MLBTV": continue 
-        is_tv_broadcast = (b_type == "TV" or (not b_type and name))
-        if "FanDuel Sports Network" in name:
-            short_name = name.replace("FanDuel Sports Network", "FanDuel").strip()
-            if not short_name or short_name == "FanDuel": short_name = "FanDuel SN" 
-            elif not short_name.startswith("FanDuel "): short_name = f"FanDuel {short_name}"
-            if broadcast.get('isNational'): national_tv.add(short_name)
-            else: regional_tv.add(short_name)
-            continue 
-        if broadcast.get('isNational') or name in ["ESPN", "FOX", "FS1", "TBS", "Apple TV+", "Peacock", "MLB Network"]:
-            if name: national_tv.add(name)
-        elif is_tv_broadcast or name: 
-            call_sign_raw = broadcast.get('callSign', '')
-            call_sign = call_sign_raw if isinstance(call_sign_raw, str) else ''
-            if call_sign and call_sign not in name and len(call_sign) < 7 and len(call_sign) > 2 : regional_tv.add(call_sign)
-            elif name: regional_tv.add(name)
-    display_list = []
-    if national_tv: display_list.extend(sorted(list(national_tv)))
-    if regional_tv:
-        allowed_regional_count = max(0, 3 - len(display_list)) 
-        if allowed_regional_count > 0: display_list.extend(sorted(list(regional_tv))[:allowed_regional_count])
-    if not display_list: return ["TBD"] 
-    return display_list
+    try: # Same contract as fetch_schedule: trust the StatsAPI shape, fall back to TBD if a game's media block is malformed
+        all_broadcast_items = list(game_data_item.get('broadcasts') or [])
+        for epg_group in ((game_data_item.get('content') or {}).get('media') or {}).get('epg') or []:
+            if (epg_group.get('title') or '').upper() in ("MLBTV", "TV"): all_broadcast_items.extend(epg_group.get('items') or [])
+        broadcast_keys = tuple(key for key in map(_broadcast_key, all_broadcast_items) if key is not None)
+        return list(_simplify_broadcast_items(broadcast_keys))
+    except (TypeError, AttributeError): return ["TBD"]
 
 # --- FETCH MLB DATA ---
-def fetch_cardinals_data(team_id, num_days):
+def _cached_statsapi_get(endpoint, params, ttl):
+    # Reuse a recent StatsAPI response from disk; one file per endpoint, keyed by the request params
+    params_key = hashlib.sha1(json.dumps([endpoint, params], sort_keys=True).encode("utf-8")).hexdigest()
+    cache_path = os.path.join(CACHE_DIR, f"statsapi_{endpoint}_{params_key}.json")
+    if os.path.exists(cache_path) and time.time() - os.path.getmtime(cache_path) < ttl:
+        try:
+            with open(cache_path) as f: response = json.load(f)
+            log.info(f"Using cached statsapi '{endpoint}' response: {cache_path}")
+            return response
+        except (OSError, ValueError) as e:
+            log.warning(f"Error reading cached statsapi response, re-fetching: {e}")
+    response = _get_statsapi().get(endpoint, params)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        for stale_name in os.listdir(CACHE_DIR): # Superseded date ranges/seasons would otherwise pile up
+            stale_path = os.path.join(CACHE_DIR, stale_name)
+            # Expired entries only, so alternating requests (e.g. the standings league fallback) keep their caches
+            if stale_name.startswith(f"statsapi_{endpoint}_") and stale_path != cache_path and time.time() - os.path.getmtime(stale_path) >= ttl:
+                os.remove(stale_path)
+        with open(cache_path, 'w') as f: json.dump(response, f)
+    except OSError as e:
+        log.warning(f"Could not cache statsapi response: {e}")
+    return response
+
+def fetch_schedule(team_id, num_days, now=None):
     games_info = []
-    standings_info = {"record": "N/A", "rank": "N/A", "gb": "N/A"}
-    start_date_dt = datetime.now()
+    start_date_dt = now or datetime.now()
     end_date_dt = start_date_dt + timedelta(days=num_days -1) 
     start_date_str = start_date_dt.strftime('%Y-%m-%d')
     end_date_str = end_date_dt.strftime('%Y-%m-%d')
-    print(f"Fetching hydrated schedule for Cardinals (ID: {team_id}) from {start_date_str} to {end_date_str} using statsapi.get()...")
+    log.info(f"Fetching hydrated schedule for Cardinals (ID: {team_id}) from {start_date_str} to {end_date_str} using statsapi.get()...")
     try:
         schedule_params = {
             'sportId': 1, 'teamId': team_id, 'startDate': start_date_str, 'endDate': end_date_str,
-            'hydrate': 'team,broadcasts(all),linescore,game(content(media(epg))),series(content),venue' 
+            'hydrate': 'team,broadcasts(all),game(content(media(epg)))', 'gameTypes': GAME_TYPES,
+            'fields': SCHEDULE_FIELDS,
         }
-        schedule_response = statsapi.get('schedule', schedule_params)
+        schedule_response = _cached_statsapi_get('schedule', schedule_params, SCHEDULE_CACHE_TTL)
         if not schedule_response or 'dates' not in schedule_response:
-            print("No schedule data returned or unexpected format from statsapi.get('schedule').")
+            log.warning("No schedule data returned or unexpected format from statsapi.get('schedule').")
         else:
             processed_games_count = 0
             for date_obj in schedule_response.get('dates', []):
                 for game_data in date_obj.get('games', []): 
                     if processed_games_count >= num_days: break
-                    game_status_obj = game_data.get('status', {})
-                    game_status = game_status_obj.get('abstractGameState', 'Unknown') if isinstance(game_status_obj, dict) else 'Unknown'
+                    try: # StatsAPI payloads are well-typed; skip malformed games instead of guarding every field
+                        game_status = (game_data.get('status') or {}).get('abstractGameState', 'Unknown')
+                        home_team_data = game_data['teams']['home']['team']
+                        away_team_data = game_data['teams']['away']['team']
+                        home_id = home_team_data.get('id')
+                        away_id = away_team_data.get('id')
+                    except (KeyError, TypeError, AttributeError): continue
                     if game_status in ["Final", "Game Over", "Completed Early", "Cancelled"]: continue
-                    teams_data = game_data.get('teams', {})
-                    home_team_data = teams_data.get('home', {}).get('team', {}) if isinstance(teams_data.get('home',{}), dict) else {}
-                    away_team_data = teams_data.get('away', {}).get('team', {}) if isinstance(teams_data.get('away',{}), dict) else {}
                     opponent_name_full = "vs Unknown" 
                     game_type = "Unknown" 
-                    home_id = home_team_data.get('id')
-                    away_id = away_team_data.get('id')
                     if home_id == team_id:
                         opponent_name_full = f"vs {away_team_data.get('name', 'Opponent')}"
                         game_type = "Home"
@@ -209,89 +376,136 @@ def fetch_cardinals_data(team_id, num_days):
                     else: continue 
                     broadcast_str_list = get_simplified_broadcasts(game_data) 
                     game_datetime_utc_str = game_data.get('gameDate') 
-                    if not game_datetime_utc_str and isinstance(date_obj, dict): 
+                    if not game_datetime_utc_str: 
                         game_datetime_utc_str = date_obj.get('date')
                     formatted_time = format_game_time(game_datetime_utc_str, DISPLAY_TIMEZONE)
-                    # Stadium name is fetched but not used in image per user request
-                    # stadium_name = game_data.get('venue', {}).get('name', 'Stadium TBD') 
                     games_info.append({
                         "opponent_full": opponent_name_full, 
                         "datetime": formatted_time, "broadcast": broadcast_str_list, 
                         "status": game_status, "game_type": game_type 
-                        # "stadium": stadium_name # No longer needed for image
                     })
                     processed_games_count += 1
                 if processed_games_count >= num_days: break
     except Exception as e:
-        print(f"Error in fetch_cardinals_data (schedule part): {e}"); traceback.print_exc()
-    print("Fetching standings using statsapi.get('standings')...")
+        log.exception(f"Error in fetch_schedule: {e}")
+    return games_info
+
+def _is_division_record(record, division_id):
+    try: return record['division']['id'] == division_id
+    except (KeyError, TypeError): return False
+
+def fetch_standings(team_id, now=None):
+    standings_info = {"record": "N/A", "rank": "N/A", "gb": "N/A"}
+    log.info("Fetching standings using statsapi.get('standings')...")
     try:
-        current_year = datetime.now().year
-        standings_params = {
-            'leagueId': "103,104", 'season': str(current_year), 'standingsTypes': 'regularSeason',
-        }
-        standings_response = statsapi.get('standings', standings_params)
-        if not standings_response or 'records' not in standings_response:
-            print("Standings data is empty or not in expected format from statsapi.get('standings').")
-        else:
-            found_team = False
-            for record in standings_response.get('records', []):
-                if found_team: break
-                if not isinstance(record, dict) or 'teamRecords' not in record: continue
-                division_name_obj = record.get('division', {})
-                division_name = division_name_obj.get('nameShort', 'N/A') if isinstance(division_name_obj, dict) else 'N/A'
-                if division_name == 'N/A' and 'league' in record: 
-                    league_name_obj = record.get('league',{})
-                    division_name = league_name_obj.get('nameShort', 'League') if isinstance(league_name_obj, dict) else 'League'
-                for team_standing in record.get('teamRecords', []):
-                    if not isinstance(team_standing, dict) or 'team' not in team_standing: continue
-                    team_api_data = team_standing.get('team', {})
-                    if not isinstance(team_api_data, dict): continue
-                    if team_api_data.get('id') == team_id:
-                        league_record = team_standing.get('leagueRecord', {})
-                        wins = league_record.get('wins', 0) if isinstance(league_record, dict) else 0
-                        losses = league_record.get('losses', 0) if isinstance(league_record, dict) else 0
-                        standings_info["record"] = f"{wins}-{losses}"
-                        rank_val = team_standing.get('divisionRank', team_standing.get('leagueRank', 'N/A'))
-                        gb_val = team_standing.get('gamesBack', 'N/A')
-                        if gb_val == '-': gb_val = '0.0' 
-                        standings_info["rank"] = f"{rank_val} in {division_name}"
-                        standings_info["gb"] = f"{gb_val} GB"
-                        found_team = True; break
-            if not found_team: print(f"Could not find Cardinals (ID: {team_id}) in standings data.")
+        current_year = (now or datetime.now()).year
+        found_team = False
+        # TEAM_LEAGUE_ID keeps the usual response to one league; both leagues are the fallback if it doesn't match TEAM_ID
+        for league_ids in (str(TEAM_LEAGUE_ID), ALL_LEAGUE_IDS):
+            standings_params = {
+                'leagueId': league_ids, 'season': str(current_year), 'standingsTypes': 'regularSeason',
+                'fields': STANDINGS_FIELDS,
+            }
+            standings_response = _cached_statsapi_get('standings', standings_params, STANDINGS_CACHE_TTL)
+            if not standings_response or 'records' not in standings_response:
+                log.warning("Standings data is empty or not in expected format from statsapi.get('standings').")
+                continue
+            records = list(standings_response.get('records', []))
+            records.sort(key=lambda record: not _is_division_record(record, TEAM_DIVISION_ID)) # Own division first
+            for record in records:
+                try:
+                    team_standing = next((ts for ts in record['teamRecords'] if isinstance(ts, dict) and (ts.get('team') or {}).get('id') == team_id), None)
+                    if team_standing is None: continue
+                    division_name = record.get('division', {}).get('nameShort', 'N/A')
+                    if division_name == 'N/A' and 'league' in record: 
+                        division_name = record['league'].get('nameShort', 'League')
+                    league_record = team_standing.get('leagueRecord', {})
+                    wins = league_record.get('wins', 0)
+                    losses = league_record.get('losses', 0)
+                except (KeyError, TypeError, AttributeError): continue
+                standings_info["record"] = f"{wins}-{losses}"
+                rank_val = team_standing.get('divisionRank', team_standing.get('leagueRank', 'N/A'))
+                gb_val = team_standing.get('gamesBack', 'N/A')
+                if gb_val == '-': gb_val = '0.0' 
+                standings_info["rank"] = f"{rank_val} in {division_name}"
+                standings_info["gb"] = f"{gb_val} GB"
+                found_team = True; break
+            if found_team: break
+            if league_ids != ALL_LEAGUE_IDS: log.warning(f"Team {team_id} not in leagueId={league_ids} standings; check TEAM_LEAGUE_ID. Retrying with both leagues.")
+        if not found_team: log.warning(f"Could not find Cardinals (ID: {team_id}) in standings data.")
     except Exception as e:
-        print(f"Error fetching standings: {e}"); traceback.print_exc()
-    return games_info, standings_info
+        log.exception(f"Error fetching standings: {e}")
+    return standings_info
 
 # --- CREATE IMAGE ---
-def create_schedule_image(games, standings, logo_obj, output_image_path):
-    img = Image.new("RGB", (IMAGE_WIDTH, IMAGE_HEIGHT), BACKGROUND_COLOR)
+def _multiline_spacing(draw, font, line_step):
+    # Pillow advances multiline text by the height of "A" plus `spacing`; solve for the spacing giving line_step
+    return line_step - draw.textbbox((0, 0), "A", font=font)[3]
+
+@functools.lru_cache(maxsize=16)
+def _label_tile(text, font):
+    # Static labels are rasterized once per font and pasted; the tile spans the text's box from the draw origin
+    _, _, right, bottom = font.getbbox(text)
+    tile = Image.new("L", (max(1, int(right)), max(1, int(bottom))), BACKGROUND_COLOR)
+    ImageDraw.Draw(tile).text((0, 0), text, font=font, fill=TEXT_COLOR)
+    return tile
+
+def _static_background(logo_obj, logo_xy, labels):
+    # Logo + section headings are the same every run: render that layer once and reuse it from CACHE_DIR.
+    # labels are (text, font, xy); the key covers layout, font files/sizes and the logo pixels
+    layout = [IMAGE_WIDTH, IMAGE_HEIGHT, BACKGROUND_COLOR, TEXT_COLOR, logo_xy,
+              [(text, getattr(font, "path", None), getattr(font, "size", None), xy) for text, font, xy in labels]]
+    key = hashlib.sha1(json.dumps(layout, default=str).encode("utf-8"))
+    if logo_obj: key.update(logo_obj.mode.encode("ascii") + logo_obj.tobytes())
+    bg_path = os.path.join(CACHE_DIR, f"bg_{key.hexdigest()}.png")
+    if os.path.exists(bg_path):
+        try:
+            bg = _open_image_file(bg_path)
+            if bg.mode == "L" and bg.size == (IMAGE_WIDTH, IMAGE_HEIGHT): return bg
+        except OSError as e:
+            log.warning(f"Error reading cached background, re-rendering: {e}")
+    bg = Image.new("L", (IMAGE_WIDTH, IMAGE_HEIGHT), BACKGROUND_COLOR)
+    if logo_obj: bg.paste(logo_obj, logo_xy, mask=logo_obj if logo_obj.mode == 'RGBA' else None)
+    for text, font, xy in labels: bg.paste(_label_tile(text, font), xy)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        for stale_name in os.listdir(CACHE_DIR): # Only the current layout/logo combination is worth keeping
+            if stale_name.startswith("bg_") and stale_name != os.path.basename(bg_path):
+                os.remove(os.path.join(CACHE_DIR, stale_name))
+        bg.save(bg_path, format="PNG", compress_level=1)
+    except OSError as e:
+        log.warning(f"Could not cache background: {e}")
+    return bg
+
+def create_schedule_image(games, standings, logo_obj, output_image_path, now=None):
+    img = _CANVAS
     draw = ImageDraw.Draw(img)
-    font_large, font_medium, font_small, font_small_bold, font_xsmall, font_medium_bold = None, None, None, None, None, None
     try:
         if FONT_PATH_REGULAR and FONT_PATH_BOLD:
-            font_large = ImageFont.truetype(FONT_PATH_BOLD, FONT_SIZE_LARGE)
-            font_medium_bold = ImageFont.truetype(FONT_PATH_BOLD, FONT_SIZE_MEDIUM_BOLD)
-            font_medium = ImageFont.truetype(FONT_PATH_REGULAR, FONT_SIZE_MEDIUM)
-            font_small = ImageFont.truetype(FONT_PATH_REGULAR, FONT_SIZE_SMALL)
-            font_small_bold = ImageFont.truetype(FONT_PATH_BOLD, FONT_SIZE_SMALL)
-            font_xsmall = ImageFont.truetype(FONT_PATH_REGULAR, FONT_SIZE_XSMALL)
-            print(f"Successfully loaded fonts by name: {FONT_PATH_BOLD}, {FONT_PATH_REGULAR}")
+            fonts = {name: _load_font(path, size) for name, (path, size) in _FONT_SPECS.items()}
+            log.info(f"Successfully loaded fonts by name: {FONT_PATH_BOLD}, {FONT_PATH_REGULAR}")
         else: raise IOError("Font paths were None.")
     except IOError: 
-        print("Defaulting to Pillow's load_default() font."); font_large, font_medium_bold, font_medium, font_small, font_small_bold, font_xsmall = [ImageFont.load_default()]*6
+        log.warning("Defaulting to Pillow's load_default() font."); fonts = dict.fromkeys(_FONT_SPECS, ImageFont.load_default())
+    text_ops = [] # (font, xy, text[, multiline spacing]), drawn grouped by font once the layout is done
     logo_x_padding, logo_y_padding = 20, 20; left_pane_width = LOGO_SIZE[0] + logo_x_padding * 2 
-    if logo_obj: img.paste(logo_obj, (logo_x_padding, logo_y_padding), mask=logo_obj if logo_obj.mode == 'RGBA' else None)
-    y_pos = logo_y_padding + LOGO_SIZE[1] + 25; standings_x = logo_x_padding
-    draw.text((standings_x, y_pos), "Standings:", font=font_medium, fill=TEXT_COLOR); y_pos += FONT_SIZE_MEDIUM + 10 
-    draw.text((standings_x, y_pos), standings.get("record", "N/A"), font=font_medium, fill=TEXT_COLOR); y_pos += FONT_SIZE_MEDIUM + 10 
-    draw.text((standings_x, y_pos), standings.get("rank", "N/A"), font=font_small, fill=TEXT_COLOR); y_pos += FONT_SIZE_SMALL + 10  
-    draw.text((standings_x, y_pos), standings.get("gb", "N/A"), font=font_small, fill=TEXT_COLOR)
-    right_pane_x_start = left_pane_width + 25; y_pos = logo_y_padding 
-    draw.text((right_pane_x_start, y_pos), "Upcoming Games:", font=font_large, fill=TEXT_COLOR); y_pos += FONT_SIZE_LARGE + 20
-    if not games: draw.text((right_pane_x_start, y_pos), "No upcoming games found.", font=font_medium, fill=TEXT_COLOR)
+    standings_x, standings_label_y = logo_x_padding, logo_y_padding + LOGO_SIZE[1] + 25
+    right_pane_x_start = left_pane_width + 25
+    img.paste(_static_background(logo_obj, (logo_x_padding, logo_y_padding), (
+        ("Standings:", fonts["medium"], (standings_x, standings_label_y)),
+        ("Upcoming Games:", fonts["large"], (right_pane_x_start, logo_y_padding)),
+    ))) # Replaces the whole canvas, so no separate clear is needed
+    y_pos = standings_label_y + FONT_SIZE_MEDIUM + 10 
+    text_ops.append((fonts["medium"], (standings_x, y_pos), standings.get("record", "N/A"))); y_pos += FONT_SIZE_MEDIUM + 10 
+    text_ops.append((fonts["small"], (standings_x, y_pos), f'{standings.get("rank", "N/A")}\n{standings.get("gb", "N/A")}',
+                     _multiline_spacing(draw, fonts["small"], FONT_SIZE_SMALL + 10))) # Rank + GB as one multiline draw
+    y_pos = logo_y_padding + FONT_SIZE_LARGE + 20
+    if not games: img.paste(_label_tile("No upcoming games found.", fonts["medium"]), (right_pane_x_start, y_pos))
     else:
         games_to_display = 3 # Try to fit 3 games with the new layout
+        tv_prefix_width = draw.textlength("TV:  ", font=fonts["small_bold"]) # Invariant across games
+        channel_x_start = right_pane_x_start + 10 + tv_prefix_width
+        channel_spacing = _multiline_spacing(draw, fonts["small"], FONT_SIZE_SMALL + 5)
         for i, game in enumerate(games):
             if i >= games_to_display : break 
             opponent_full_text, datetime_text, broadcast_list, game_type_text = game.get("opponent_full", "N/A"), game.get("datetime", "N/A"), game.get("broadcast", ["TBD"]), game.get("game_type", "")
@@ -308,68 +522,123 @@ def create_schedule_image(games, standings, logo_obj, output_image_path):
                                 30) # Overall padding for game block
                                 
             if y_pos + estimated_height > IMAGE_HEIGHT - logo_y_padding - FONT_SIZE_XSMALL - 10 : 
-                print(f"Not enough vertical space for game {i+1}."); 
-                if i < 1: draw.text((right_pane_x_start, y_pos), "Not enough space for game details.", font=font_small, fill=TEXT_COLOR)
+                log.warning(f"Not enough vertical space for game {i+1}."); 
+                if i < 1: text_ops.append((fonts["small"], (right_pane_x_start, y_pos), "Not enough space for game details."))
                 break
             
-            draw.text((right_pane_x_start, y_pos), datetime_text, font=font_medium_bold, fill=TEXT_COLOR); y_pos += FONT_SIZE_MEDIUM_BOLD + 8
+            text_ops.append((fonts["medium_bold"], (right_pane_x_start, y_pos), datetime_text)); y_pos += FONT_SIZE_MEDIUM_BOLD + 8
             
             # Truncate opponent_display_text if necessary
             available_width_for_opponent = IMAGE_WIDTH - (right_pane_x_start + 10) - 10
-            current_opponent_display_text = opponent_display_text
-            while draw.textlength(current_opponent_display_text, font=font_medium) > available_width_for_opponent and len(current_opponent_display_text) > 10: 
-                current_opponent_display_text = current_opponent_display_text[:-4] + "..."
-            draw.text((right_pane_x_start + 10, y_pos), current_opponent_display_text, font=font_medium, fill=TEXT_COLOR); y_pos += FONT_SIZE_MEDIUM + 10
+            current_opponent_display_text = _truncate_to_width(draw, opponent_display_text, fonts["medium"], available_width_for_opponent)
+            text_ops.append((fonts["medium"], (right_pane_x_start + 10, y_pos), current_opponent_display_text)); y_pos += FONT_SIZE_MEDIUM + 10
             
             if broadcast_list:
-                tv_label_y = y_pos; draw.text((right_pane_x_start + 10, tv_label_y), "TV:", font=font_small_bold, fill=TEXT_COLOR)
-                channel_x_start = right_pane_x_start + 10 + draw.textlength("TV:  ", font=font_small_bold) 
-                current_line_y = tv_label_y
+                tv_label_y = y_pos; img.paste(_label_tile("TV:", fonts["small_bold"]), (right_pane_x_start + 10, tv_label_y))
+                current_line_y = tv_label_y; visible_channels = []
                 for k, channel in enumerate(broadcast_list):
                     if k > 0: current_line_y += FONT_SIZE_SMALL + 5
                     if current_line_y > IMAGE_HEIGHT - (FONT_SIZE_SMALL + 5) : break 
-                    draw.text((channel_x_start, current_line_y), channel, font=font_small, fill=TEXT_COLOR)
+                    visible_channels.append(channel)
+                if visible_channels: # One multiline draw per game, spaced to the same FONT_SIZE_SMALL + 5 line step
+                    text_ops.append((fonts["small"], (channel_x_start, tv_label_y), "\n".join(visible_channels), channel_spacing))
                 y_pos = current_line_y + FONT_SIZE_SMALL + 5
-            else: draw.text((right_pane_x_start + 10, y_pos), "TV: TBD", font=font_small_bold, fill=TEXT_COLOR); y_pos += FONT_SIZE_SMALL + 5
+            else: img.paste(_label_tile("TV: TBD", fonts["small_bold"]), (right_pane_x_start + 10, y_pos)); y_pos += FONT_SIZE_SMALL + 5
             y_pos += 25 
-    refresh_date_str = f"Data refreshed on {datetime.now().strftime('%m-%d-%Y')}"
-    text_width = draw.textlength(refresh_date_str, font=font_xsmall)
+    refresh_date_str = f"Data refreshed on {(now or datetime.now()).strftime('%m-%d-%Y')}"
+    text_width = draw.textlength(refresh_date_str, font=fonts["xsmall"])
     text_x = IMAGE_WIDTH - text_width - 15; text_y = IMAGE_HEIGHT - FONT_SIZE_XSMALL - 15 
-    draw.text((text_x, text_y), refresh_date_str, font=font_xsmall, fill=TEXT_COLOR)
-    eink_image = img.convert("1", dither=Image.Dither.NONE); 
+    text_ops.append((fonts["xsmall"], (text_x, text_y), refresh_date_str))
+    # Draw all text of one face together instead of alternating FreeType faces line by line
+    for font, xy, text, *spacing in sorted(text_ops, key=lambda op: id(op[0])):
+        draw.text(xy, text, font=font, fill=TEXT_COLOR, spacing=spacing[0] if spacing else 4)
+    import numpy as np # Imported here so runs that skip rendering never load it
+    # Threshold at 128 (what convert("1", dither=NONE) does) and pack 8 pixels per byte in one vectorized pass
+    eink_bits = np.packbits(np.asarray(img) >= 128, axis=1)
+    eink_image = Image.frombytes("1", img.size, eink_bits.tobytes())
+    png_buffer = BytesIO()
+    eink_image.save(png_buffer, format="PNG", optimize=False, compress_level=1) # Fast zlib level; 1-bit output stays small
+    png_bytes = png_buffer.getvalue()
+    if os.path.exists(output_image_path):
+        with open(output_image_path, 'rb') as f:
+            if f.read() == png_bytes:
+                log.info(f"Rendered image is identical to {output_image_path}. Leaving it untouched.")
+                return False
     os.makedirs(os.path.dirname(output_image_path), exist_ok=True)
-    eink_image.save(output_image_path); print(f"Image saved as {output_image_path}")
+    with open(output_image_path, 'wb') as f: f.write(png_bytes)
+    log.info(f"Image saved as {output_image_path}")
+    return True
+
+def render_cache_key(games, standings, logo_obj, now):
+    # Everything that ends up in the image: game/standings data, the footer date, the logo pixels,
+    # and the code + fonts that lay it out (so a pushed layout change re-renders even with a restored .cache)
+    with open(__file__, 'rb') as f: script_digest = hashlib.sha256(f.read()).hexdigest()
+    payload = {
+        "games": games, "standings": standings, "refresh_date": now.strftime('%m-%d-%Y'),
+        "logo": hashlib.sha256(logo_obj.tobytes()).hexdigest() if logo_obj else None,
+        "script": script_digest, "fonts": _FONT_SPECS,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
 
 # --- MAIN EXECUTION ---
 if __name__ == "__main__":
-    print("Starting St. Louis Cardinals schedule image generation...")
-    upcoming_games, current_standings = fetch_cardinals_data(TEAM_ID, DAYS_AHEAD)
-    print("\nFetched Games:")
+    log.info("Starting St. Louis Cardinals schedule image generation...")
+    run_now = datetime.now() # One timestamp for the fetch window, image footer and JSON filename
+    # Schedule, standings and logo are independent network fetches, so overlap their latency
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        schedule_future = executor.submit(fetch_schedule, TEAM_ID, DAYS_AHEAD, run_now)
+        standings_future = executor.submit(fetch_standings, TEAM_ID, run_now)
+        logo_future = executor.submit(get_team_logo, LOGO_URL, LOGO_SIZE)
+        upcoming_games = schedule_future.result()
+        current_standings = standings_future.result()
+        cardinals_logo = logo_future.result()
     if upcoming_games:
+        log.info(f"Fetched {len(upcoming_games)} upcoming games.")
         for game in upcoming_games: 
             broadcast_display = "/".join(game['broadcast']) if isinstance(game['broadcast'], list) else game['broadcast']
-            # Updated print to show game_type, stadium is no longer in game dict for image
-            print(f"- {game.get('opponent_full','N/A')} ({game.get('game_type','?')}) on {game['datetime']} (TV: {broadcast_display})")
-    else: print("No upcoming games data fetched.")
-    print("\nCurrent Standings:")
-    print(f"- Record: {current_standings['record']}")
-    print(f"- Rank: {current_standings['rank']}")
-    print(f"- GB: {current_standings['gb']}")
-    cardinals_logo = get_team_logo(LOGO_URL, LOGO_SIZE)
-    if not cardinals_logo: print("Could not load logo. Proceeding without it.")
-    create_schedule_image(upcoming_games, current_standings, cardinals_logo, LOCAL_IMAGE_FULL_PATH)
-    print(f"\nGenerating {JSON_REDIRECT_FILENAME} content...")
+            # Per-game detail is only logged with LOG_LEVEL=DEBUG
+            log.debug(f"- {game.get('opponent_full','N/A')} ({game.get('game_type','?')}) on {game['datetime']} (TV: {broadcast_display})")
+    else: log.info("No upcoming games data fetched.")
+    log.info("Current Standings:")
+    log.info(f"- Record: {current_standings['record']}")
+    log.info(f"- Rank: {current_standings['rank']}")
+    log.info(f"- GB: {current_standings['gb']}")
+    if not cardinals_logo: log.warning("Could not load logo. Proceeding without it.")
+    render_key = render_cache_key(upcoming_games, current_standings, cardinals_logo, run_now)
+    previous_render_key = None
+    if os.path.exists(RENDER_CACHE_PATH):
+        with open(RENDER_CACHE_PATH) as f: previous_render_key = f.read().strip()
+    image_changed = False
+    if previous_render_key == render_key and os.path.exists(LOCAL_IMAGE_FULL_PATH):
+        log.info(f"Schedule, standings and logo unchanged since the last render. Keeping {LOCAL_IMAGE_FULL_PATH}.")
+    else:
+        image_changed = create_schedule_image(upcoming_games, current_standings, cardinals_logo, LOCAL_IMAGE_FULL_PATH, run_now)
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(RENDER_CACHE_PATH, 'w') as f: f.write(render_key)
+        except OSError as e:
+            log.warning(f"Could not save render cache key: {e}")
+    log.info(f"Generating {JSON_REDIRECT_FILENAME} content...")
     actual_repo_owner = GITHUB_REPO_OWNER 
     actual_repo_name = GITHUB_REPO_NAME
     default_branch = "main" 
     static_image_url_in_repo = f"https://raw.githubusercontent.com/{actual_repo_owner}/{actual_repo_name}/{default_branch}/{IMAGE_PATH_IN_REPO}"
-    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+    timestamp = run_now.strftime("%Y%m%d%H%M%S")
     dynamic_filename_for_json_property = f"cardinals_schedule_{timestamp}.png" 
     redirect_json_content = {
         "url": static_image_url_in_repo, 
         "filename": dynamic_filename_for_json_property,
         "refresh_rate": 21600 # Added refresh_rate
     }
+    if not image_changed and os.path.exists(JSON_REDIRECT_FILENAME):
+        # Same image bytes: keep the previous cache-busting filename so the workflow has nothing to commit
+        try:
+            with open(JSON_REDIRECT_FILENAME) as f: previous_json_content = json.load(f)
+            if {**previous_json_content, "filename": None} == {**redirect_json_content, "filename": None}:
+                redirect_json_content["filename"] = previous_json_content["filename"]
+                log.info(f"Image unchanged. Keeping filename {redirect_json_content['filename']}.")
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            log.warning(f"Could not read previous {JSON_REDIRECT_FILENAME}: {e}")
     try:
         # Ensure directory for JSON exists if JSON_REDIRECT_FILENAME includes a path
         json_dir = os.path.dirname(JSON_REDIRECT_FILENAME)
@@ -377,12 +646,13 @@ if __name__ == "__main__":
             os.makedirs(json_dir, exist_ok=True)
         
         with open(JSON_REDIRECT_FILENAME, 'w') as f:
-            json.dump(redirect_json_content, f, indent=2)
-        print(f"Successfully saved {JSON_REDIRECT_FILENAME} locally.")
+            if DEBUG: json.dump(redirect_json_content, f, indent=2)
+            else: json.dump(redirect_json_content, f, separators=(",", ":")) # Read by the device, not people
+        log.info(f"Successfully saved {JSON_REDIRECT_FILENAME} locally.")
     except Exception as e:
-        print(f"Error saving {JSON_REDIRECT_FILENAME} locally: {e}"); traceback.print_exc()
-    print("\nScript finished. Image and JSON redirect file are saved locally.")
-    print(f"Image at: {LOCAL_IMAGE_FULL_PATH}")
-    print(f"JSON at: {JSON_REDIRECT_FILENAME}")
-    print("The GitHub Actions workflow will handle committing and deploying these files.")
+        log.exception(f"Error saving {JSON_REDIRECT_FILENAME} locally: {e}")
+    log.info("Script finished. Image and JSON redirect file are saved locally.")
+    log.info(f"Image at: {LOCAL_IMAGE_FULL_PATH}")
+    log.info(f"JSON at: {JSON_REDIRECT_FILENAME}")
+    log.info("The GitHub Actions workflow will handle committing and deploying these files.")
 